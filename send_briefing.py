@@ -1,24 +1,28 @@
 import os
 import io
+import math
 import json
 import time
+import pickle
+import hashlib
 import zipfile
 import logging
+import threading
 import datetime as dt
 import xml.etree.ElementTree as ET
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from functools import lru_cache
+from functools import lru_cache, wraps
 from zoneinfo import ZoneInfo
 
 import requests
-import feedparser
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from pykrx import stock
-from openai import OpenAI
 
 
 # =========================
@@ -42,8 +46,15 @@ HTTP_USER_AGENT = os.environ.get(
 PYKRX_SLEEP_SEC = float(os.environ.get("PYKRX_SLEEP_SEC", "0.05"))
 KR_UNIVERSE_EACH = int(os.environ.get("KR_UNIVERSE_EACH", "60"))
 KR_TOP_PRE_FLOW = int(os.environ.get("KR_TOP_PRE_FLOW", "12"))
-
-client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
+RSS_WORKERS = int(os.environ.get("RSS_WORKERS", "16"))
+KR_SCORE_WORKERS = int(os.environ.get("KR_SCORE_WORKERS", "24"))
+MAIN_WORKERS = int(os.environ.get("MAIN_WORKERS", "8"))
+YF_CACHE_TTL_SEC = float(os.environ.get("YF_CACHE_TTL_SEC", str(3 * 3600)))
+PYKRX_RETRIES = int(os.environ.get("PYKRX_RETRIES", "3"))
+KR_HISTORY_DAYS = int(os.environ.get("KR_HISTORY_DAYS", "25"))
+HTTP_CONNECT_TIMEOUT_SEC = float(os.environ.get("HTTP_CONNECT_TIMEOUT_SEC", "3.05"))
+YF_TIMEOUT_SEC = float(os.environ.get("YF_TIMEOUT_SEC", "10"))
+OPENAI_TIMEOUT_SEC = float(os.environ.get("OPENAI_TIMEOUT_SEC", "120"))
 
 US_TICKERS = {
     "엔비디아(NVDA)": "NVDA",
@@ -61,6 +72,12 @@ SEC_8K_ATOM = {
     "PLTR": "https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK=0001321655&type=8-K&owner=exclude&count=20&output=atom",
 }
 
+YF_INDEXES = ["^IXIC", "^GSPC", "^KS11", "^KQ11", "^VIX"]
+# Indexes and FX only need their last two closes; the US tickers need
+# ~3 months for MA20 / RSI / 3-month high.
+YF_SHORT_SYMBOLS = YF_INDEXES + ["KRW=X"]
+YF_HISTORY_SYMBOLS = list(US_TICKERS.values())
+
 
 # =========================
 # Logging
@@ -86,7 +103,7 @@ def build_session() -> requests.Session:
         allowed_methods=frozenset(["GET", "POST"]),
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=20, pool_maxsize=20)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=32, pool_maxsize=32)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     session.headers.update(
@@ -111,9 +128,9 @@ def kst_now() -> dt.datetime:
 
 def is_nan(x) -> bool:
     try:
-        return pd.isna(x)
-    except Exception:
-        return x != x
+        return math.isnan(x)
+    except TypeError:
+        return bool(pd.isna(x))
 
 
 def safe_float(x, default=float("nan")) -> float:
@@ -151,24 +168,145 @@ def uniq_keep_order(items: list[str]) -> list[str]:
     return out
 
 
+def coalesce_calls(fn):
+    # Like lru_cache, but a caller arriving while the same call is still
+    # running waits for that result instead of starting a duplicate.
+    lock = threading.Lock()
+    calls: dict = {}
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            fut = calls.get(key)
+            owner = fut is None
+            if owner:
+                fut = calls[key] = Future()
+        if owner:
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                with lock:
+                    calls.pop(key, None)
+                fut.set_exception(e)
+        return fut.result()
+
+    return wrapper
+
+
+# =========================
+# File cache
+# =========================
+class FileCache:
+    def __init__(self, directory: Path, ttl_sec: float):
+        self.directory = directory
+        self.ttl_sec = ttl_sec
+
+    def path(self, key) -> Path:
+        digest = hashlib.md5(repr(key).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.pkl"
+
+    def get(self, key, default=None):
+        path = self.path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_sec:
+                return default
+            return pickle.loads(path.read_bytes())
+        except FileNotFoundError:
+            return default
+        except Exception:
+            logger.exception("file cache read failed: %s", path)
+            return default
+
+    def set(self, key, value) -> None:
+        path = self.path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(pickle.dumps(value))
+            tmp.replace(path)
+        except Exception:
+            logger.exception("file cache write failed: %s", path)
+
+
+def prune_file_cache(max_age_days: int = 7) -> None:
+    cutoff = time.time() - max_age_days * 86400
+    for path in CACHE_DIR.glob("*/*.pkl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except Exception:
+            logger.exception("file cache prune failed: %s", path)
+
+
+def is_empty_result(value) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.empty
+    if isinstance(value, (list, tuple, dict)):
+        return not value
+    return False
+
+
+def file_cached(ttl: float, key=None, cache_if=None):
+    def decorator(fn):
+        cache = FileCache(CACHE_DIR / fn.__name__, ttl_sec=ttl)
+        miss = object()
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            k = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            value = cache.get(k, miss)
+            if value is not miss:
+                return value
+            value = fn(*args, **kwargs)
+            keep = cache_if(value) if cache_if else not is_empty_result(value)
+            if keep:
+                cache.set(k, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
 # =========================
 # Telegram
 # =========================
-def telegram_send(text: str) -> None:
-    max_len = 3800
+def split_message(text: str, max_len: int = 3800) -> list[str]:
     parts = []
-    buf = text.strip()
+    buf: list[str] = []
+    size = 0
 
-    while len(buf) > max_len:
-        cut = buf.rfind("\n", 0, max_len)
-        if cut < 800:
-            cut = max_len
-        parts.append(buf[:cut])
-        buf = buf[cut:].lstrip("\n")
+    def flush() -> None:
+        nonlocal buf, size
+        if buf:
+            parts.append("\n".join(buf))
+        buf, size = [], 0
 
-    if buf:
-        parts.append(buf)
+    for line in text.strip().split("\n"):
+        if not buf and not line:
+            continue
+        while len(line) > max_len:
+            flush()
+            parts.append(line[:max_len])
+            line = line[max_len:]
+        need = len(line) + (1 if buf else 0)
+        if size + need > max_len:
+            flush()
+            if not line:
+                continue
+            need = len(line)
+        buf.append(line)
+        size += need
+
+    flush()
+    return parts
 
+
+def telegram_send(text: str) -> None:
+    parts = split_message(text)
     url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
 
     for i, part in enumerate(parts, start=1):
@@ -180,7 +318,7 @@ def telegram_send(text: str) -> None:
                     "text": part,
                     "disable_web_page_preview": True,
                 },
-                timeout=30,
+                timeout=(HTTP_CONNECT_TIMEOUT_SEC, 30),
             )
             logger.info("telegram send part=%s status=%s", i, r.status_code)
             r.raise_for_status()
@@ -192,74 +330,225 @@ def telegram_send(text: str) -> None:
 # =========================
 # RSS / NEWS
 # =========================
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={}&hl=ko&gl=KR&ceid=KR:ko"
+
+
 def google_news_rss(query: str) -> str:
-    q = requests.utils.quote(query)
-    return f"https://news.google.com/rss/search?q={q}&hl=ko&gl=KR&ceid=KR:ko"
+    return GOOGLE_NEWS_RSS.format(requests.utils.quote(query))
 
 
-def fetch_rss(url: str, limit: int = 3) -> list[tuple[str, str]]:
+US_NEWS_URLS = {tkr: google_news_rss(f"{tkr} {name}") for name, tkr in US_TICKERS.items()}
+
+
+def xml_local_name(tag) -> str:
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def parse_feed_entries(content: bytes, limit: int) -> list[tuple[str, str]]:
+    out = []
+    seen = 0
     try:
-        r = SESSION.get(url, timeout=15)
-        r.raise_for_status()
-        feed = feedparser.parse(r.content)
+        for _, el in ET.iterparse(io.BytesIO(content), events=("end",)):
+            if xml_local_name(el.tag) not in ("item", "entry"):
+                continue
+
+            title = ""
+            link = ""
+            for child in el:
+                name = xml_local_name(child.tag)
+                if name == "title":
+                    title = (child.text or "").strip()
+                elif name == "link" and not link and child.get("rel", "alternate") == "alternate":
+                    link = (child.text or child.get("href") or "").strip()
+            el.clear()
 
-        out = []
-        for e in (feed.entries or [])[:limit]:
-            title = (getattr(e, "title", "") or "").strip()
-            link = (getattr(e, "link", "") or "").strip()
             if title:
                 out.append((title, link))
-        return out
+            seen += 1
+            if seen >= limit:
+                break
+    except ET.ParseError:
+        logger.warning("rss parse stopped early after %s entries", seen)
+    return out
+
+
+@coalesce_calls
+@file_cached(ttl=3600, key=lambda url, limit=3: (url, limit))
+def fetch_rss(url: str, limit: int = 3) -> list[tuple[str, str]]:
+    try:
+        r = SESSION.get(url, timeout=(HTTP_CONNECT_TIMEOUT_SEC, 10))
+        r.raise_for_status()
+        return parse_feed_entries(r.content, limit)
     except Exception:
         logger.exception("rss fetch failed: %s", url)
         return []
 
 
+def fetch_all_rss(urls: list[str], limit: int = 3) -> dict[str, list[tuple[str, str]]]:
+    urls = uniq_keep_order(urls)
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(RSS_WORKERS, len(urls))) as ex:
+        results = ex.map(lambda u: fetch_rss(u, limit=limit), urls)
+        return dict(zip(urls, results))
+
+
 # =========================
 # OpenAI summary
 # =========================
+AI_MODEL = "gpt-5-mini"
+AI_SYSTEM_PROMPT = "너는 신중하고 사실 기반의 투자 뉴스 요약가야."
+AI_SUMMARY_RULES = (
+    "규칙:\n"
+    "- 4~6줄 요약\n"
+    "- 긍정 1줄, 리스크 1줄, 오늘 체크포인트 1줄 포함\n"
+    "- 과장/확정적 예언 금지, 가능성 표현 사용\n"
+    "- 링크는 요약문에 넣지 말고, 아래 원문 목록으로만 유지\n"
+)
+AI_NO_KEY_TEXT = "AI 요약: (OPENAI_API_KEY가 없어 요약을 생략했어요.)"
+AI_NO_BULLETS_TEXT = "AI 요약: (요약할 뉴스/공시가 부족했어요.)"
+
+
+@lru_cache(maxsize=1)
+def ai_client():
+    if not OPENAI_API_KEY:
+        return None
+    from openai import OpenAI
+
+    return OpenAI(api_key=OPENAI_API_KEY, timeout=OPENAI_TIMEOUT_SEC, max_retries=2)
+
+
+def response_text(resp) -> str:
+    text = getattr(resp, "output_text", None)
+    if text:
+        return text.strip()
+
+    data = resp.to_dict() if hasattr(resp, "to_dict") else {}
+    chunks = []
+    for item in data.get("output", []):
+        for c in item.get("content", []):
+            if c.get("type") in ("output_text", "text"):
+                chunks.append(c.get("text", ""))
+    return "\n".join(x.strip() for x in chunks if x and x.strip()).strip()
+
+
 def ai_summarize(bundle_title: str, bullets: list[str]) -> str:
+    client = ai_client()
     if not client:
-        return "AI 요약: (OPENAI_API_KEY가 없어 요약을 생략했어요.)"
+        return AI_NO_KEY_TEXT
     if not bullets:
-        return "AI 요약: (요약할 뉴스/공시가 부족했어요.)"
+        return AI_NO_BULLETS_TEXT
 
     prompt = (
         f"다음은 '{bundle_title}' 관련 최신 뉴스/공시 헤드라인 목록이야.\n"
         f"한국어로, 투자 초보도 이해할 수 있게 요약해줘.\n"
-        f"규칙:\n"
-        f"- 4~6줄 요약\n"
-        f"- 긍정 1줄, 리스크 1줄, 오늘 체크포인트 1줄 포함\n"
-        f"- 과장/확정적 예언 금지, 가능성 표현 사용\n"
-        f"- 링크는 요약문에 넣지 말고, 아래 원문 목록으로만 유지\n\n"
-        f"헤드라인:\n" + "\n".join(bullets[:12])
+        + AI_SUMMARY_RULES
+        + "\n헤드라인:\n" + "\n".join(bullets[:12])
     )
 
     try:
         resp = client.responses.create(
-            model="gpt-5-mini",
+            model=AI_MODEL,
             input=[
-                {"role": "system", "content": "너는 신중하고 사실 기반의 투자 뉴스 요약가야."},
+                {"role": "system", "content": AI_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
         )
-        text = getattr(resp, "output_text", None)
-        if text:
-            return "AI 요약:\n" + text.strip()
-
-        data = resp.to_dict() if hasattr(resp, "to_dict") else {}
-        chunks = []
-        for item in data.get("output", []):
-            for c in item.get("content", []):
-                if c.get("type") in ("output_text", "text"):
-                    chunks.append(c.get("text", ""))
-        merged = "\n".join(x.strip() for x in chunks if x and x.strip()).strip()
+        merged = response_text(resp)
         return "AI 요약:\n" + (merged if merged else "(요약 결과를 읽지 못했어요.)")
     except Exception as e:
         logger.exception("ai summarize failed: %s", bundle_title)
         return f"AI 요약: (요약 중 오류로 생략했어요: {type(e).__name__})"
 
 
+def ai_summarize_many(bundles: dict[str, list[str]]) -> dict[str, str]:
+    client = ai_client()
+    if not client:
+        return {title: AI_NO_KEY_TEXT for title in bundles}
+
+    out = {title: AI_NO_BULLETS_TEXT for title, bullets in bundles.items() if not bullets}
+    pending = {f"b{i}": title for i, (title, bullets) in enumerate(bundles.items(), start=1) if bullets}
+    if len(pending) <= 1:
+        out.update({title: ai_summarize(title, bundles[title]) for title in pending.values()})
+        return out
+
+    sections = [
+        f"[{key}] {title}\n" + "\n".join(bundles[title][:12])
+        for key, title in pending.items()
+    ]
+    prompt = (
+        "아래는 여러 묶음의 최신 뉴스/공시 헤드라인 목록이야.\n"
+        "묶음마다 따로, 한국어로, 투자 초보도 이해할 수 있게 요약해줘.\n"
+        + AI_SUMMARY_RULES
+        + f"- 응답은 JSON 객체 하나로만: 키는 묶음 ID({', '.join(pending)}), 값은 요약 문자열\n\n"
+        + "\n\n".join(sections)
+    )
+
+    summaries = {}
+    try:
+        resp = client.responses.create(
+            model=AI_MODEL,
+            input=[
+                {"role": "system", "content": AI_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            text={"format": {"type": "json_object"}},
+        )
+        summaries = json.loads(response_text(resp) or "{}")
+    except Exception:
+        logger.exception("ai batch summarize failed")
+
+    retry = []
+    for key, title in pending.items():
+        text = summaries.get(key) if isinstance(summaries, dict) else None
+        if isinstance(text, str) and text.strip():
+            out[title] = "AI 요약:\n" + text.strip()
+        else:
+            retry.append(title)
+
+    if retry:
+        logger.warning("ai batch summary missing %s bundle(s), summarizing separately", len(retry))
+        with ThreadPoolExecutor(max_workers=len(retry)) as ex:
+            out.update(zip(retry, ex.map(lambda t: ai_summarize(t, bundles[t]), retry)))
+    return out
+
+
+# =========================
+# pykrx
+# =========================
+class RateLimiter:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Shared by every worker: PYKRX_SLEEP_SEC spaces the per-ticker history/flow requests made via
+# pykrx_call. Market-wide lookups call stock.* directly and are not paced.
+PYKRX_LIMITER = RateLimiter(PYKRX_SLEEP_SEC)
+
+
+def pykrx_call(fn, *args, retries: int | None = None, backoff: float = 0.5, **kwargs):
+    retries = PYKRX_RETRIES if retries is None else retries
+    for attempt in range(1, retries + 1):
+        PYKRX_LIMITER.wait()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            if attempt >= retries:
+                raise
+            logger.warning("pykrx %s failed (attempt %s/%s), retrying", fn.__name__, attempt, retries)
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
+
 # =========================
 # Market dates (KRX)
 # =========================
@@ -270,7 +559,7 @@ def fallback_weekday_ymd(base_date: dt.date | None = None) -> str:
     return d.strftime("%Y%m%d")
 
 
-@lru_cache(maxsize=128)
+@coalesce_calls
 def business_days_between(from_ymd: str, to_ymd: str) -> list[str]:
     try:
         days = stock.get_previous_business_days(fromdate=from_ymd, todate=to_ymd)
@@ -280,7 +569,7 @@ def business_days_between(from_ymd: str, to_ymd: str) -> list[str]:
         return []
 
 
-@lru_cache(maxsize=128)
+@coalesce_calls
 def recent_business_days(end_ymd: str, n: int) -> list[str]:
     start = (pd.Timestamp(end_ymd) - pd.Timedelta(days=max(n * 3, 10))).strftime("%Y%m%d")
     days = business_days_between(start, end_ymd)
@@ -310,34 +599,97 @@ def effective_krx_close_date(now: dt.datetime | None = None, final_hour: int = 1
 # =========================
 # Market / FX
 # =========================
-def get_usdkrw(default=1350.0) -> float:
+@lru_cache(maxsize=4)
+@file_cached(
+    ttl=YF_CACHE_TTL_SEC,
+    key=lambda symbols, period: (symbols, period),
+    cache_if=lambda prices: bool(prices) and all(not frame.empty for frame in prices.values()),
+)
+def prefetch_yf(symbols: tuple[str, ...], period: str) -> dict[str, pd.DataFrame]:
+    prices: dict[str, pd.DataFrame] = {}
+
+    try:
+        raw = yf.download(
+            tickers=" ".join(symbols),
+            period=period,
+            group_by="ticker",
+            auto_adjust=True,
+            actions=False,
+            threads=True,
+            progress=False,
+            timeout=YF_TIMEOUT_SEC,
+        )
+        if raw is not None and not raw.empty and isinstance(raw.columns, pd.MultiIndex):
+            present = set(raw.columns.get_level_values(0))
+            for sym in symbols:
+                if sym in present:
+                    prices[sym] = raw[sym][["Close"]].dropna()
+    except Exception:
+        logger.exception("yfinance batch download failed")
+
+    for sym in symbols:
+        frame = prices.get(sym)
+        if frame is not None and not frame.empty:
+            continue
+        try:
+            prices[sym] = yf.Ticker(sym).history(period=period, actions=False, timeout=YF_TIMEOUT_SEC)[["Close"]].dropna()
+        except Exception:
+            logger.exception("yfinance history fallback failed: %s", sym)
+            prices[sym] = pd.DataFrame()
+
+    return prices
+
+
+def prefetch_market_data() -> dict[str, pd.DataFrame]:
+    prices = dict(prefetch_yf(tuple(YF_SHORT_SYMBOLS), "1mo"))
+    prices.update(prefetch_yf(tuple(YF_HISTORY_SYMBOLS), "3mo"))
+    return prices
+
+
+def get_usdkrw(prices: dict[str, pd.DataFrame], default=1350.0) -> float:
     try:
-        fx = yf.Ticker("KRW=X").history(period="10d").dropna()
+        fx = prices.get("KRW=X", pd.DataFrame())
         if fx.empty:
             return default
-        return float(fx["Close"].iloc[-1])
+        return float(fx["Close"].iat[-1])
     except Exception:
         logger.exception("usdkrw fetch failed")
         return default
 
 
-def get_index_return(ticker: str) -> float:
+def get_index_return(ticker: str, prices: dict[str, pd.DataFrame]) -> float:
     try:
-        h = yf.Ticker(ticker).history(period="10d").dropna()
+        h = prices.get(ticker, pd.DataFrame())
         if len(h) < 2:
             return float("nan")
-        close = float(h["Close"].iloc[-1])
-        prev = float(h["Close"].iloc[-2])
+        close = float(h["Close"].iat[-1])
+        prev = float(h["Close"].iat[-2])
         return (close / prev - 1.0) * 100.0
     except Exception:
         logger.exception("index return fetch failed: %s", ticker)
         return float("nan")
 
 
+def investor_flow_by_label(df: pd.DataFrame) -> dict | None:
+    # get_market_trading_value_by_investor: 투자자 구분이 index(…/기관합계/기타법인/개인/외국인/기타외국인/전체)
+    try:
+        return {
+            "foreign": safe_float(df.at["외국인", "순매수"]),
+            "inst": safe_float(df.at["기관합계", "순매수"]),
+        }
+    except KeyError:
+        logger.debug("investor flow labels not found, falling back to scan: %s", list(df.index))
+        return None
+
+
 def parse_investor_flow_df(df: pd.DataFrame) -> dict | None:
     if df is None or df.empty:
         return None
 
+    flow = investor_flow_by_label(df)
+    if flow is not None:
+        return flow
+
     try:
         idx_as_str = [str(x) for x in df.index]
 
@@ -380,14 +732,13 @@ def kospi_flow(date: str) -> dict | None:
         return None
 
 
-def market_brief() -> tuple[str, str]:
-    nasdaq = get_index_return("^IXIC")
-    spx = get_index_return("^GSPC")
-    kospi = get_index_return("^KS11")
-    kosdaq = get_index_return("^KQ11")
-    vix = get_index_return("^VIX")
+def market_brief(prices: dict[str, pd.DataFrame], krx_date: str) -> tuple[str, str]:
+    nasdaq = get_index_return("^IXIC", prices)
+    spx = get_index_return("^GSPC", prices)
+    kospi = get_index_return("^KS11", prices)
+    kosdaq = get_index_return("^KQ11", prices)
+    vix = get_index_return("^VIX", prices)
 
-    krx_date = effective_krx_close_date()
     flow = kospi_flow(krx_date)
 
     risk_hits = 0
@@ -446,47 +797,98 @@ def market_brief() -> tuple[str, str]:
 # =========================
 # Technical / Signals
 # =========================
-def rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    delta = series.diff()
-    gain = delta.clip(lower=0).rolling(period).mean()
-    loss = (-delta.clip(upper=0)).rolling(period).mean()
-    rs = gain / (loss.replace(0, 1e-9))
-    return 100 - (100 / (1 + rs))
+def wilder_mean(x: np.ndarray, period: int) -> np.ndarray:
+    # Same recurrence as Series.ewm(alpha=1/period, adjust=False).mean(),
+    # run across all rows at once; leading NaN padding is skipped per row.
+    alpha = 1.0 / period
+    out = np.full(x.shape[0], np.nan)
+    for col in x.T:
+        valid = ~np.isnan(col)
+        out = np.where(valid & np.isnan(out), col, np.where(valid, out + alpha * (col - out), out))
+    return out
 
 
-def rolling_high(series: pd.Series, window: int = 63) -> float:
-    try:
-        return float(series.tail(window).max())
-    except Exception:
-        return float("nan")
+def rsi_last(close: np.ndarray, period: int = 14) -> np.ndarray:
+    close = np.atleast_2d(close)
+    if close.shape[1] <= period:
+        return np.full(close.shape[0], np.nan)
+    delta = np.diff(close, axis=1)
+    gain = wilder_mean(np.clip(delta, 0, None), period)
+    loss = wilder_mean(np.clip(-delta, 0, None), period)
+    rs = gain / np.where(loss == 0, 1e-9, loss)
+    enough = (~np.isnan(delta)).sum(axis=1) >= period
+    return np.where(enough, 100 - (100 / (1 + rs)), np.nan)
 
 
-def exit_signals_302020(close, ma20, rsi_v, chg5d, high_3m):
-    flags = []
-    dist20 = float("nan")
+def rolling_high(close: np.ndarray, window: int = 63) -> np.ndarray:
+    close = np.atleast_2d(close)
+    if close.shape[1] == 0:
+        return np.full(close.shape[0], np.nan)
+    return np.nanmax(close[:, -window:], axis=1)
+
+
+def stack_closes(series_list: list[pd.Series]) -> np.ndarray:
+    width = max((len(x) for x in series_list), default=0)
+    mat = np.full((len(series_list), width), np.nan)
+    for i, series in enumerate(series_list):
+        arr = series.to_numpy(dtype=np.float64)
+        if arr.size:
+            mat[i, width - arr.size:] = arr
+    return mat
+
+
+def compute_panel_indicators(close: np.ndarray, period: int = 14, window: int = 63) -> dict[str, np.ndarray]:
+    n_rows, n_days = close.shape
+    nan = np.full(n_rows, np.nan)
+
+    last = close[:, -1] if n_days >= 1 else nan
+    prev = close[:, -2] if n_days >= 2 else nan
+    c5 = close[:, -6] if n_days >= 6 else nan
+    ma20 = close[:, -20:].mean(axis=1) if n_days >= 20 else nan
+    high = rolling_high(close, window=window)
+    rsi_v = rsi_last(close, period=period)
 
-    if (not is_nan(rsi_v)) and rsi_v >= 70:
-        flags.append("RSI≥70")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chg1d = np.where(prev != 0, (last / prev - 1.0) * 100.0, np.nan)
+        chg5d = np.where(c5 != 0, (last / c5 - 1.0) * 100.0, np.nan)
+        dist20 = np.where(ma20 != 0, (last / ma20 - 1.0) * 100.0, np.nan)
 
-    if (not is_nan(ma20)) and ma20 != 0 and (not is_nan(close)):
-        dist20 = (close / ma20 - 1.0) * 100.0
-        if dist20 >= 6:
-            flags.append("20일선+6%↑")
+    return {
+        "close": last,
+        "chg1d": chg1d,
+        "chg5d": chg5d,
+        "ma20": ma20,
+        "dist20": dist20,
+        "rsi": rsi_v,
+        "high_3m": high,
+    }
 
-    if (not is_nan(chg5d)) and chg5d >= 12:
-        flags.append("5D+12%↑")
 
-    if (not is_nan(high_3m)) and (not is_nan(close)) and high_3m != 0:
-        if close >= high_3m * 0.98:
-            flags.append("3개월고점근처")
+def panel_rows(codes: list[str], indicators: dict[str, np.ndarray]) -> dict[str, dict[str, float]]:
+    return {
+        code: {name: float(values[i]) for name, values in indicators.items()}
+        for i, code in enumerate(codes)
+    }
 
+
+def exit_signals_302020(close, ma20, rsi_v, chg5d, high_3m):
+    # NaN compares False, so missing indicators simply don't raise a flag.
+    dist20 = (close / ma20 - 1.0) * 100.0 if ma20 and not is_nan(ma20) else float("nan")
+    near_high = bool(high_3m) and not is_nan(high_3m) and close >= high_3m * 0.98
+
+    flags = [
+        label
+        for label, hit in (
+            ("RSI≥70", rsi_v >= 70),
+            ("20일선+6%↑", dist20 >= 6),
+            ("5D+12%↑", chg5d >= 12),
+            ("3개월고점근처", near_high),
+        )
+        if hit
+    ]
     n = len(flags)
 
-    if n >= 3 and (
-        ((not is_nan(rsi_v)) and rsi_v >= 80)
-        or ((not is_nan(chg5d)) and chg5d >= 15)
-        or ("3개월고점근처" in flags and (not is_nan(dist20)) and dist20 >= 9)
-    ):
+    if n >= 3 and (rsi_v >= 80 or chg5d >= 15 or (near_high and dist20 >= 9)):
         action = "✅ 3차 익절(추가20%, 총80%) 후보"
     elif n >= 3:
         action = "✅ 2차 익절(추가30%, 총60%) 후보"
@@ -517,47 +919,68 @@ def entry_plan_by_ma(close, ma20, market_level, currency="$"):
 # =========================
 # US snapshot + news
 # =========================
-def us_snapshot(ticker: str) -> dict | None:
+def us_snapshots(tickers: list[str], prices: dict[str, pd.DataFrame]) -> dict[str, dict | None]:
+    out: dict[str, dict | None] = dict.fromkeys(tickers)
     try:
-        data = yf.Ticker(ticker).history(period="3mo").dropna()
-        if data.empty or len(data) < 25:
-            return None
+        valid = [t for t in tickers if len(prices.get(t, pd.DataFrame())) >= 25]
+        if not valid:
+            return out
+
+        closes = stack_closes([prices[t]["Close"] for t in valid])
+        rows = panel_rows(valid, compute_panel_indicators(closes))
+        for t in valid:
+            out[t] = {k: rows[t][k] for k in ("close", "chg1d", "chg5d", "ma20", "rsi", "high_3m")}
+    except Exception:
+        logger.exception("us snapshot failed: %s", ", ".join(tickers))
+    return out
 
-        close = float(data["Close"].iloc[-1])
-        prev = float(data["Close"].iloc[-2])
-        chg1d = (close / prev - 1.0) * 100.0 if prev != 0 else float("nan")
 
-        chg5d = float("nan")
-        if len(data) >= 6:
-            c5 = float(data["Close"].iloc[-6])
-            chg5d = (close / c5 - 1.0) * 100.0 if c5 != 0 else float("nan")
+def format_us_block(name: str, s: dict, usdkrw: float, market_level: str) -> str:
+    close = s["close"]
+    action, flags_txt, dist20 = exit_signals_302020(
+        close=close,
+        ma20=s["ma20"],
+        rsi_v=s["rsi"],
+        chg5d=s["chg5d"],
+        high_3m=s["high_3m"],
+    )
+    entry_txt = entry_plan_by_ma(close, s["ma20"], market_level, currency="$")
+    rsi_txt = "N/A" if is_nan(s["rsi"]) else f"{s['rsi']:.0f}"
+
+    return (
+        f"\n• {name}\n"
+        f"  - 종가: ${close:.2f} (₩{close * usdkrw:,.0f})\n"
+        f"  - 1D: {fmt_pct(s['chg1d'])} | 5D: {fmt_pct(s['chg5d'])}\n"
+        f"  - 20일선 대비: {fmt_pct(dist20)} | RSI: {rsi_txt}\n"
+        f"  - 익절 신호: {flags_txt}\n"
+        f"  - 오늘 액션: {action}\n"
+        f"  - {entry_txt}"
+    )
 
-        ma20 = float(data["Close"].rolling(20).mean().iloc[-1])
-        rsi_v = float(rsi(data["Close"]).iloc[-1])
-        high_3m = rolling_high(data["Close"], window=63)
 
-        return {
-            "close": close,
-            "chg1d": chg1d,
-            "chg5d": chg5d,
-            "ma20": ma20,
-            "rsi": rsi_v,
-            "high_3m": high_3m,
-        }
-    except Exception:
-        logger.exception("us snapshot failed: %s", ticker)
-        return None
+def us_news_urls(tkr: str) -> list[str]:
+    urls = [US_NEWS_URLS[tkr]]
+    sec_url = SEC_8K_ATOM.get(tkr)
+    if sec_url:
+        urls.append(sec_url)
+    return urls
 
 
-def build_us_news_bullets(name: str, tkr: str, limit_google=3, limit_sec=2) -> list[str]:
+def build_us_news_bullets(
+    name: str,
+    tkr: str,
+    feeds: dict[str, list[tuple[str, str]]],
+    limit_google=3,
+    limit_sec=2,
+) -> list[str]:
     bullets = []
 
-    for title, link in fetch_rss(google_news_rss(f"{tkr} {name}"), limit=limit_google):
+    for title, link in feeds.get(US_NEWS_URLS[tkr], [])[:limit_google]:
         bullets.append(f"[GOOGLE] {title} - {link}")
 
     sec_url = SEC_8K_ATOM.get(tkr)
     if sec_url:
-        for title, link in fetch_rss(sec_url, limit=limit_sec):
+        for title, link in feeds.get(sec_url, [])[:limit_sec]:
             bullets.append(f"[SEC 8-K] {title} - {link}")
 
     return uniq_keep_order(bullets)
@@ -575,6 +998,7 @@ def kr_name(code: str) -> str:
         return code
 
 
+@file_cached(ttl=86400)
 def kr_price_batch(date: str, market: str) -> pd.DataFrame:
     try:
         df = stock.get_market_ohlcv(date, market=market)
@@ -586,6 +1010,7 @@ def kr_price_batch(date: str, market: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@file_cached(ttl=86400)
 def kr_fundamental_batch(date: str, market: str) -> pd.DataFrame:
     try:
         df = stock.get_market_fundamental(date, market=market)
@@ -597,13 +1022,14 @@ def kr_fundamental_batch(date: str, market: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@file_cached(ttl=86400, key=lambda code, end_date, days=65: (code, end_date, days))
 def kr_recent_history(code: str, end_date: str, days: int = 65) -> pd.DataFrame:
     try:
         bdays = recent_business_days(end_date, days)
         if not bdays:
             return pd.DataFrame()
         start = bdays[0]
-        df = stock.get_market_ohlcv_by_date(start, end_date, code)
+        df = pykrx_call(stock.get_market_ohlcv_by_date, start, end_date, code)
         if df is None or df.empty:
             return pd.DataFrame()
         return df
@@ -617,14 +1043,14 @@ def kr_one_day_change(code: str, date: str) -> tuple[float, float]:
     if hist.empty or len(hist) < 2:
         return float("nan"), float("nan")
 
-    close = safe_float(hist["종가"].iloc[-1])
-    prev = safe_float(hist["종가"].iloc[-2])
-    chg1d = (close / prev - 1.0) * 100.0 if prev and prev == prev else float("nan")
+    closes = hist["종가"].to_numpy(dtype=np.float64)
+    close = float(closes[-1])
+    prev = float(closes[-2])
+    chg1d = (close / prev - 1.0) * 100.0 if prev and not is_nan(prev) else float("nan")
     return close, chg1d
 
 
-def kr_core_block(market_level: str):
-    date = effective_krx_close_date()
+def kr_core_block(date: str) -> str:
     blocks = ["🇰🇷 국내 핵심(보유/관심)"]
 
     markets = {
@@ -644,14 +1070,14 @@ def kr_core_block(market_level: str):
         close = float("nan")
         chg1d = float("nan")
         if code in price_df.index:
-            close = safe_float(price_df.loc[code, "종가"])
+            close = safe_float(price_df.at[code, "종가"])
             _, chg1d = kr_one_day_change(code, date)
 
         per = float("nan")
         eps = float("nan")
         if code in fund_df.index:
-            per = safe_float(fund_df.loc[code, "PER"])
-            eps = safe_float(fund_df.loc[code, "EPS"])
+            per = safe_float(fund_df.at[code, "PER"])
+            eps = safe_float(fund_df.at[code, "EPS"])
 
         if is_nan(close):
             blocks.append(f"\n• {label}\n  - 데이터 수신이 불안정해서 오늘은 국내 가격을 못 불러왔어요.")
@@ -663,7 +1089,7 @@ def kr_core_block(market_level: str):
             f"  - PER: {('N/A' if is_nan(per) else f'{per:.1f}')} | EPS: {('N/A' if is_nan(eps) else f'{eps:,.0f}')}"
         )
 
-    return "\n".join(blocks), date
+    return "\n".join(blocks)
 
 
 # =========================
@@ -673,7 +1099,7 @@ def corp_code_cache_path() -> Path:
     return CACHE_DIR / "dart_corp_codes.json"
 
 
-def load_corp_code_cache(max_age_days: int = 30) -> dict[str, str]:
+def load_corp_code_cache(max_age_days: int = 90) -> dict[str, str]:
     path = corp_code_cache_path()
     if not path.exists():
         return {}
@@ -697,6 +1123,7 @@ def save_corp_code_cache(data: dict[str, str]) -> None:
         logger.exception("corp code cache save failed")
 
 
+@lru_cache(maxsize=1)
 def get_dart_corp_code_map() -> dict[str, str]:
     if not DART_API_KEY:
         return {}
@@ -707,19 +1134,19 @@ def get_dart_corp_code_map() -> dict[str, str]:
 
     try:
         url = f"https://opendart.fss.or.kr/api/corpCode.xml?crtfc_key={DART_API_KEY}"
-        r = SESSION.get(url, timeout=30)
+        r = SESSION.get(url, timeout=(HTTP_CONNECT_TIMEOUT_SEC, 30))
         r.raise_for_status()
 
-        z = zipfile.ZipFile(io.BytesIO(r.content))
-        xml_bytes = z.read("CORPCODE.xml")
-        root = ET.fromstring(xml_bytes)
-
         mapping = {}
-        for item in root.findall("list"):
-            stock_code = (item.findtext("stock_code") or "").strip()
-            corp_code = (item.findtext("corp_code") or "").strip()
-            if stock_code and corp_code:
-                mapping[stock_code] = corp_code
+        with zipfile.ZipFile(io.BytesIO(r.content)) as z, z.open("CORPCODE.xml") as fh:
+            for _, item in ET.iterparse(fh, events=("end",)):
+                if item.tag != "list":
+                    continue
+                stock_code = (item.findtext("stock_code") or "").strip()
+                corp_code = (item.findtext("corp_code") or "").strip()
+                if stock_code and corp_code:
+                    mapping[stock_code] = corp_code
+                item.clear()
 
         if mapping:
             save_corp_code_cache(mapping)
@@ -729,6 +1156,7 @@ def get_dart_corp_code_map() -> dict[str, str]:
         return {}
 
 
+@lru_cache(maxsize=128)
 def dart_find_corp_code(stock_code: str) -> str | None:
     return get_dart_corp_code_map().get(stock_code)
 
@@ -737,14 +1165,15 @@ def dart_recent_disclosures(corp_code: str, limit=3) -> list[tuple[str, str]]:
     if not DART_API_KEY or not corp_code:
         return []
     try:
-        end = kst_now().strftime("%Y%m%d")
-        start = (kst_now() - dt.timedelta(days=7)).strftime("%Y%m%d")
+        now = kst_now()
+        end = now.strftime("%Y%m%d")
+        start = (now - dt.timedelta(days=7)).strftime("%Y%m%d")
         url = (
             "https://opendart.fss.or.kr/api/list.json"
             f"?crtfc_key={DART_API_KEY}&corp_code={corp_code}"
             f"&bgn_de={start}&end_de={end}&page_no=1&page_count=10"
         )
-        r = SESSION.get(url, timeout=30)
+        r = SESSION.get(url, timeout=(HTTP_CONNECT_TIMEOUT_SEC, 30))
         r.raise_for_status()
         data = r.json()
         items = data.get("list", [])[:limit]
@@ -780,37 +1209,24 @@ def build_dart_bullets_for_core() -> list[str]:
 # =========================
 # KR recommendations
 # =========================
-def build_universe_top_caps(date: str, n_each: int = 60) -> pd.DataFrame:
-    frames = []
+def build_universe_top_caps(date: str, n_each: int = 60) -> list[str]:
+    codes = []
     for market in ["KOSPI", "KOSDAQ"]:
         try:
             cap = stock.get_market_cap(date, market=market)
             if cap is None or cap.empty:
                 continue
-            cap = cap.sort_values("시가총액", ascending=False).head(n_each).copy()
-            cap["market"] = market
-            frames.append(cap)
+            codes.extend(cap.nlargest(n_each, "시가총액").index.tolist())
         except Exception:
             logger.exception("market cap batch failed: %s %s", date, market)
+    return codes
 
-    if not frames:
-        return pd.DataFrame()
-    return pd.concat(frames, axis=0)
-
-
-def candidate_base_score(code: str, date: str, fund_row: pd.Series | None) -> dict | None:
-    hist = kr_recent_history(code, date, days=65)
-    time.sleep(PYKRX_SLEEP_SEC)
-
-    if hist.empty or len(hist) < 20:
-        return None
-
-    close = safe_float(hist["종가"].iloc[-1])
-    ma20 = safe_float(hist["종가"].rolling(20).mean().iloc[-1])
 
-    c5 = safe_float(hist["종가"].iloc[-6]) if len(hist) >= 6 else float("nan")
-    mom5 = (close / c5 - 1.0) * 100.0 if (not is_nan(c5)) and c5 != 0 else float("nan")
-    dist20 = (close / ma20 - 1.0) * 100.0 if (not is_nan(ma20)) and ma20 != 0 else float("nan")
+def candidate_base_score(code: str, ind: dict[str, float], fund_row: pd.Series | None) -> dict | None:
+    close = ind["close"]
+    ma20 = ind["ma20"]
+    mom5 = ind["chg5d"]
+    dist20 = ind["dist20"]
 
     if (not is_nan(dist20)) and dist20 >= 12:
         return None
@@ -853,9 +1269,16 @@ def candidate_base_score(code: str, date: str, fund_row: pd.Series | None) -> di
     }
 
 
+def rank_candidates(cands: list[dict]) -> list[dict]:
+    def key(c: dict) -> tuple[float, float]:
+        return tuple(-math.inf if is_nan(c[k]) else c[k] for k in ("score", "mom5"))
+
+    return sorted(cands, key=key, reverse=True)
+
+
 def kr_investor_flow_by_ticker(code: str, date: str) -> dict | None:
     try:
-        df = stock.get_market_trading_value_by_investor(date, date, code)
+        df = pykrx_call(stock.get_market_trading_value_by_investor, date, date, code)
         return parse_investor_flow_df(df)
     except Exception:
         logger.exception("ticker investor flow failed: %s %s", code, date)
@@ -866,7 +1289,6 @@ def apply_flow_adjustment(cands: list[dict], date: str) -> list[dict]:
     out = []
     for c in cands:
         flow = kr_investor_flow_by_ticker(c["code"], date)
-        time.sleep(PYKRX_SLEEP_SEC)
 
         bonus = 0.0
         if flow:
@@ -886,9 +1308,7 @@ def apply_flow_adjustment(cands: list[dict], date: str) -> list[dict]:
     return out
 
 
-def kr_recommendations(market_level: str, max_picks=3):
-    date = effective_krx_close_date()
-
+def kr_recommendations(market_level: str, date: str, max_picks=3):
     if market_level == "bad":
         return {
             "date": date,
@@ -901,7 +1321,7 @@ def kr_recommendations(market_level: str, max_picks=3):
         }
 
     uni = build_universe_top_caps(date, n_each=KR_UNIVERSE_EACH)
-    if uni.empty:
+    if not uni:
         return {
             "date": date,
             "picks": [],
@@ -916,10 +1336,22 @@ def kr_recommendations(market_level: str, max_picks=3):
         axis=0,
     )
 
+    # Non-positive EPS is rejected by candidate_base_score anyway; drop those
+    # tickers before paying for their per-ticker OHLCV history.
+    profitable = set()
+    if "EPS" in fund_all.columns:
+        profitable = set(fund_all.index[pd.to_numeric(fund_all["EPS"], errors="coerce") > 0])
+    codes = [code for code in uni if code in profitable]
+    with ThreadPoolExecutor(max_workers=KR_SCORE_WORKERS) as ex:
+        hists = dict(zip(codes, ex.map(lambda code: kr_recent_history(code, date, days=KR_HISTORY_DAYS), codes)))
+
+    valid = [code for code in codes if len(hists[code]) >= 20]
+    rows = panel_rows(valid, compute_panel_indicators(stack_closes([hists[c]["종가"] for c in valid]))) if valid else {}
+
     candidates = []
-    for code in uni.index.tolist():
+    for code in valid:
         fund_row = fund_all.loc[code] if code in fund_all.index else None
-        c = candidate_base_score(code, date, fund_row)
+        c = candidate_base_score(code, rows[code], fund_row)
         if c:
             candidates.append(c)
 
@@ -933,18 +1365,11 @@ def kr_recommendations(market_level: str, max_picks=3):
             ),
         }
 
-    pre_top = (
-        pd.DataFrame(candidates)
-        .sort_values(["score", "mom5"], ascending=[False, False])
-        .head(KR_TOP_PRE_FLOW)
-        .to_dict(orient="records")
-    )
-
+    pre_top = rank_candidates(candidates)[:KR_TOP_PRE_FLOW]
     rescored = apply_flow_adjustment(pre_top, date)
-    df = pd.DataFrame(rescored).sort_values(["score", "mom5"], ascending=[False, False])
 
     pick_n = 2 if market_level == "meh" else max_picks
-    picks = df.head(pick_n).to_dict(orient="records")
+    picks = rank_candidates(rescored)[:pick_n]
 
     if not picks:
         return {
@@ -991,12 +1416,16 @@ def kr_recommendations(market_level: str, max_picks=3):
     return {"date": date, "picks": picks, "text": "\n".join(lines)}
 
 
-def kr_reco_news_bullets(picks, limit_each=2) -> list[str]:
+def kr_reco_news_url(code: str) -> str:
+    return google_news_rss(f"{kr_name(code)} {code}")
+
+
+def kr_reco_news_bullets(picks, feeds: dict[str, list[tuple[str, str]]], limit_each=2) -> list[str]:
     bullets = []
     for p in picks:
         code = p["code"]
         name = kr_name(code)
-        for title, link in fetch_rss(google_news_rss(f"{name} {code}"), limit=limit_each):
+        for title, link in feeds.get(kr_reco_news_url(code), [])[:limit_each]:
             bullets.append(f"[GOOGLE] {name}: {title} - {link}")
     return uniq_keep_order(bullets)
 
@@ -1008,85 +1437,97 @@ def main():
     now = kst_now()
     if "your_email@example.com" in HTTP_USER_AGENT:
         logger.warning("SEC 호출용 HTTP_USER_AGENT에 실제 연락처를 넣는 것을 권장합니다.")
+    prune_file_cache()
 
     header = f"📌 데일리 브리핑 (KST {now:%Y-%m-%d %H:%M})"
-    usdkrw = get_usdkrw()
-    fxline = f"💱 USD/KRW: {usdkrw:,.2f}"
 
-    market_text, market_level = market_brief()
+    # Independent network stages run side by side; the KR recommendation
+    # pass needs market_level, so it waits for prices + KOSPI flow below.
+    with ThreadPoolExecutor(max_workers=MAIN_WORKERS) as ex:
+        prices_f = ex.submit(prefetch_market_data)
+        us_feeds_f = ex.submit(
+            fetch_all_rss,
+            [url for tkr in US_TICKERS.values() for url in us_news_urls(tkr)],
+            3,
+        )
+        dart_f = ex.submit(build_dart_bullets_for_core)
+
+        kr_date = effective_krx_close_date(now)
+        kr_core_f = ex.submit(kr_core_block, kr_date)
+
+        prices = prices_f.result()
+        market_text, market_level = market_brief(prices, kr_date)
+
+        us_feeds = us_feeds_f.result()
+        kr_core_text = kr_core_f.result()
+        dart_bullets = dart_f.result()
+
+    usdkrw = get_usdkrw(prices)
+    fxline = f"💱 USD/KRW: {usdkrw:,.2f}"
 
     # ---------- US section ----------
     us_lines = ["🇺🇸 미국 3종목 (원화환산 + 기술지표 + 오늘 액션)"]
-    us_ai_blocks = []
+    us_ai_titles = []
+    ai_bundles: dict[str, list[str]] = {}
+
+    snapshots = us_snapshots(list(US_TICKERS.values()), prices)
 
     for name, tkr in US_TICKERS.items():
-        s = us_snapshot(tkr)
+        s = snapshots.get(tkr)
         if not s:
             us_lines.append(f"\n• {name}\n  - 데이터 수신이 불안정해서 오늘은 가격을 못 불러왔어요.")
             continue
 
-        close = s["close"]
-        krw_price = close * usdkrw
-        action, flags_txt, dist20 = exit_signals_302020(
-            close=close,
-            ma20=s["ma20"],
-            rsi_v=s["rsi"],
-            chg5d=s["chg5d"],
-            high_3m=s["high_3m"],
-        )
-        entry_txt = entry_plan_by_ma(close, s["ma20"], market_level, currency="$")
-
-        us_lines.append(
-            f"\n• {name}\n"
-            f"  - 종가: ${close:.2f} (₩{krw_price:,.0f})\n"
-            f"  - 1D: {fmt_pct(s['chg1d'])} | 5D: {fmt_pct(s['chg5d'])}\n"
-            f"  - 20일선 대비: {fmt_pct(dist20)} | RSI: {('N/A' if is_nan(s['rsi']) else format(s['rsi'], '.0f'))}\n"
-            f"  - 익절 신호: {flags_txt}\n"
-            f"  - 오늘 액션: {action}\n"
-            f"  - {entry_txt}"
-        )
+        us_lines.append(format_us_block(name, s, usdkrw, market_level))
 
-        bullets = build_us_news_bullets(name, tkr, limit_google=3, limit_sec=2)
+        bullets = build_us_news_bullets(name, tkr, us_feeds, limit_google=3, limit_sec=2)
         if bullets:
             us_lines.append("  - 뉴스 링크:")
             for b in bullets[:5]:
                 us_lines.append("    • " + b.split("] ", 1)[-1])
-            us_ai_blocks.append(ai_summarize(f"{name} (미국)", bullets))
+            us_ai_titles.append(f"{name} (미국)")
+            ai_bundles[f"{name} (미국)"] = bullets
 
     us_text = "\n".join(us_lines)
-    us_ai_text = (
-        "\n\n".join(["🤖 미국 뉴스/공시 AI 요약"] + us_ai_blocks)
-        if us_ai_blocks
-        else "🤖 미국 뉴스/공시 AI 요약\nAI 요약: (요약할 자료가 부족했어요.)"
-    )
-
-    # ---------- KR core ----------
-    kr_core_text, kr_date = kr_core_block(market_level)
 
     # ---------- KR DART ----------
-    dart_bullets = build_dart_bullets_for_core() if DART_API_KEY else []
-    dart_ai_text = "🤖 국내 공시(DART) AI 요약\n" + ai_summarize("국내 공시(DART)", dart_bullets)
+    ai_bundles["국내 공시(DART)"] = dart_bullets
 
     # ---------- KR recommendations ----------
-    reco = kr_recommendations(market_level, max_picks=3)
+    reco = kr_recommendations(market_level, kr_date, max_picks=3)
     kr_reco_text = reco["text"]
     kr_picks = reco["picks"]
 
-    kr_reco_ai_text = ""
+    links_lines = []
     if kr_picks:
-        kr_news_bullets = kr_reco_news_bullets(kr_picks, limit_each=2)
-        links_lines = ["\n📰 추천 종목 뉴스 링크"]
+        kr_feeds = fetch_all_rss([kr_reco_news_url(p["code"]) for p in kr_picks], limit=2)
+        kr_news_bullets = kr_reco_news_bullets(kr_picks, kr_feeds, limit_each=2)
+        ai_bundles["국내 추천주(뉴스)"] = kr_news_bullets
+        links_lines = ["📰 추천 종목 뉴스 링크"]
         for b in kr_news_bullets[:8]:
             links_lines.append("• " + b.split("] ", 1)[-1])
-        kr_reco_ai_text = (
-            "\n\n🤖 국내 추천주 뉴스 AI 요약\n"
-            + ai_summarize("국내 추천주(뉴스)", kr_news_bullets)
-            + "\n"
-            + "\n".join(links_lines)
+
+    # ---------- AI summaries (one batched request) ----------
+    summaries = ai_summarize_many(ai_bundles)
+
+    us_ai_text = (
+        "\n\n".join(["🤖 미국 뉴스/공시 AI 요약"] + [summaries[t] for t in us_ai_titles])
+        if us_ai_titles
+        else "🤖 미국 뉴스/공시 AI 요약\nAI 요약: (요약할 자료가 부족했어요.)"
+    )
+    dart_ai_text = "🤖 국내 공시(DART) AI 요약\n" + summaries["국내 공시(DART)"]
+
+    kr_reco_ai_text = ""
+    if kr_picks:
+        kr_reco_ai_text = "\n\n".join(
+            [
+                "🤖 국내 추천주 뉴스 AI 요약\n" + summaries["국내 추천주(뉴스)"],
+                "\n".join(links_lines),
+            ]
         )
 
     guide = (
-        "\n\n🧭 선배 익절 전략(확정)\n"
+        "🧭 선배 익절 전략(확정)\n"
         "- 신호 2개↑: 1차 익절 30%\n"
         "- 신호 3개↑: 2차 익절 추가 30%(총 60%)\n"
         "- 신호 3개 + 강과열: 3차 익절 추가 20%(총 80%)\n"
@@ -1094,28 +1535,29 @@ def main():
     )
 
     edu = (
-        "\n\n📚 오늘의 매매 타이밍 원칙\n"
+        "📚 오늘의 매매 타이밍 원칙\n"
         "- 시장 bad면 신규는 쉬는 게 확률이 좋아요.\n"
         "- 종목은 ‘20일선 근처(±2%)’에서 분할 진입이 가장 편합니다.\n"
         "- 익절은 수익률이 아니라 ‘과열 신호’로 판단하면 흔들림이 줄어요."
     )
 
-    footer = f"\n\n🗓 국내 데이터 기준일: {kr_date} (오후 6시 이전 실행 시 전 영업일 기준)"
-
-    msg = (
-        header + "\n\n"
-        + fxline + "\n\n"
-        + market_text + "\n\n"
-        + us_text + "\n\n"
-        + us_ai_text + "\n\n"
-        + kr_core_text + "\n\n"
-        + dart_ai_text + "\n\n"
-        + kr_reco_text
-        + (kr_reco_ai_text if kr_reco_ai_text else "")
-        + guide
-        + edu
-        + footer
-    )
+    footer = f"🗓 국내 데이터 기준일: {kr_date} (오후 6시 이전 실행 시 전 영업일 기준)"
+
+    parts = [
+        header,
+        fxline,
+        market_text,
+        us_text,
+        us_ai_text,
+        kr_core_text,
+        dart_ai_text,
+        kr_reco_text,
+        kr_reco_ai_text,
+        guide,
+        edu,
+        footer,
+    ]
+    msg = "\n\n".join(p for p in parts if p)
 
     telegram_send(msg)
 